@@ -1,29 +1,61 @@
 import os
+import asyncio
+import hashlib
+from functools import lru_cache
 from typing import List, Optional
-from fastapi import FastAPI, Query
+import msgspec
+import numpy as np
+import orjson
+from fastapi import FastAPI, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from starlette.routing import Route
 from datetime import date, timedelta
 
-app = FastAPI()
+# numba is optional: without it the sprint kernel runs as plain Python
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# The database module is optional (added by enable-database); resolve it once at startup
+db_error: Optional[str] = None
+try:
+    from database import db
+except ImportError:
+    db = None
+    db_error = "❌ Database module not found (run enable-database first)"
+except Exception as e:
+    db = None
+    db_error = f"❌ Error: {str(e)[:50]}"
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Credentialed CORS can't use a wildcard origin; FRONTEND_ORIGIN takes a comma-separated list
+ALLOWED_ORIGINS = frozenset(
+    origin.strip()
+    for origin in os.getenv("FRONTEND_ORIGIN", "http://localhost:3000").split(",")
+    if origin.strip()
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
-class KPI(BaseModel):
+class KPI(msgspec.Struct):
     label: str
     value: float
     delta: Optional[float] = None
     help: Optional[str] = None
 
 
-class VelocityPoint(BaseModel):
+class VelocityPoint(msgspec.Struct):
     key: str
     start: date
     end: date
@@ -31,7 +63,7 @@ class VelocityPoint(BaseModel):
     completed: float
 
 
-class CommitmentPoint(BaseModel):
+class CommitmentPoint(msgspec.Struct):
     sprint: str
     committed: float
     completed: float
@@ -39,20 +71,20 @@ class CommitmentPoint(BaseModel):
     percent: float
 
 
-class RolloverPoint(BaseModel):
+class RolloverPoint(msgspec.Struct):
     sprint: str
     percent: float
     committed: float
     rolled: float
 
 
-class ScopeSummary(BaseModel):
+class ScopeSummary(msgspec.Struct):
     avg_added: float
     avg_removed: float
     avg_net_percent: float
 
 
-class SprintRow(BaseModel):
+class SprintRow(msgspec.Struct):
     sprint: str
     start: date
     end: date
@@ -66,7 +98,7 @@ class SprintRow(BaseModel):
     items_reopened: int
 
 
-class TeamDashboardResponse(BaseModel):
+class TeamDashboardResponse(msgspec.Struct):
     team_name: str
     kpis: List[KPI]
     velocity: List[VelocityPoint]
@@ -76,18 +108,47 @@ class TeamDashboardResponse(BaseModel):
     sprint_rows: List[SprintRow]
 
 
-@app.get("/")
-def read_root():
-    return {"message": "Hello from FastAPI Backend!"}
+# msgspec schemas aren't picked up by FastAPI, so the dashboard schema is published by hand
+(_DASHBOARD_SCHEMA,), _SCHEMA_COMPONENTS = msgspec.json.schema_components(
+    [TeamDashboardResponse], ref_template="#/components/schemas/{name}"
+)
+
+
+def custom_openapi() -> dict:
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_SCHEMA_COMPONENTS)
+    return app.openapi_schema
+
+
+app.openapi = custom_openapi
+
+
+# Constant bodies, encoded once
+_ROOT = orjson.dumps({"message": "Hello from FastAPI Backend!"})
+_HELLO = orjson.dumps({"message": "Hello from the backend API!"})
+
+
+async def read_root(request: Request) -> Response:
+    return Response(_ROOT, media_type="application/json")
+
+
+async def hello(request: Request) -> Response:
+    return Response(_HELLO, media_type="application/json")
+
+
+# Plain Starlette routes, matched ahead of FastAPI's so they skip dependency resolution entirely
+app.router.routes.insert(0, Route("/", read_root, methods=["GET"]))
+app.router.routes.insert(1, Route("/api/hello", hello, methods=["GET"]))
 
 
-@app.get("/api/hello")
-def hello():
-    return {"message": "Hello from the backend API!"}
+# /test is a diagnostics endpoint and is only registered when ENV=dev
+DEBUG = os.getenv("ENV", "prod") == "dev"
+_HAS_DATABASE_URL = bool(os.getenv("DATABASE_URL"))
+_HAS_DATABASE_NAME = bool(os.getenv("DATABASE_NAME"))
 
 
-@app.get("/test")
-def test_database():
+async def test_database():
     """Test endpoint to check if database is available and accessible"""
     response = {
         "backend": "✅ Running",
@@ -98,49 +159,84 @@ def test_database():
         "collections": []
     }
 
-    try:
-        from database import db
-
-        if db is not None:
-            response["database"] = "✅ Available"
-            response["database_url"] = "✅ Configured"
-            response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
-            response["connection_status"] = "Connected"
-
-            try:
-                collections = db.list_collection_names()
-                response["collections"] = collections[:10]
-                response["database"] = "✅ Connected & Working"
-            except Exception as e:
-                response["database"] = f"⚠️  Connected but Error: {str(e)[:50]}"
-        else:
-            response["database"] = "⚠️  Available but not initialized"
-
-    except ImportError:
-        response["database"] = "❌ Database module not found (run enable-database first)"
-    except Exception as e:
-        response["database"] = f"❌ Error: {str(e)[:50]}"
-
-    import os
-    response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
+    if db_error is not None:
+        response["database"] = db_error
+    elif db is not None:
+        response["database"] = "✅ Available"
+        response["database_url"] = "✅ Configured"
+        response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
+        response["connection_status"] = "Connected"
+
+        try:
+            collections = await asyncio.get_running_loop().run_in_executor(None, db.list_collection_names)
+            response["collections"] = collections[:10]
+            response["database"] = "✅ Connected & Working"
+        except Exception as e:
+            response["database"] = f"⚠️  Connected but Error: {str(e)[:50]}"
+    else:
+        response["database"] = "⚠️  Available but not initialized"
+
+    response["database_url"] = "✅ Set" if _HAS_DATABASE_URL else "❌ Not Set"
+    response["database_name"] = "✅ Set" if _HAS_DATABASE_NAME else "❌ Not Set"
 
     return response
 
 
-@app.get("/api/team-dashboard", response_model=TeamDashboardResponse)
-def team_dashboard(
-    team_id: str = Query("team-1"),
-    team_name: str = Query("Alpha Team"),
-    grouping: str = Query("By sprint", pattern="^(By sprint|By week|By month)$"),
-    include_done_only: bool = Query(False),
-    item_types: List[str] = Query(["Stories", "Bugs", "Tasks", "Epics"]) 
-):
+if DEBUG:
+    app.add_api_route("/test", test_database, methods=["GET"])
+
+
+DEFAULT_TEAM_NAME = "Alpha Team"
+_SPRINT_NAMES = tuple(f"Sprint {k}" for k in range(1, 33))
+
+# (label, delta, help) for each KPI, in display order
+_KPI_META = (
+    ("Velocity", 1.2, "Average story points completed per sprint in the selected range."),
+    ("Throughput", -0.5, "Number of items completed per sprint in the selected range."),
+    ("Commitment completion %", 2.1, "Completed points divided by points committed at sprint start."),
+    ("Rollover rate %", -1.4, "Rolled-over points divided by committed points."),
+    ("DoR compliance %", 0.8, "Percentage of items that met Definition of Ready before sprint start."),
+    ("Bug ratio", -0.1, "Number of bugs divided by number of stories completed."),
+)
+
+
+@njit(cache=True)
+def _sprint_metrics(base_points, sprint_count):
+    """Per-sprint metric columns, latest sprint first (index k holds sprint i = sprint_count - 1 - k)"""
+    committed = np.empty(sprint_count)
+    completed = np.empty(sprint_count)
+    rollover = np.empty(sprint_count)
+    percent = np.empty(sprint_count)
+    roll_percent = np.empty(sprint_count)
+    dor = np.empty(sprint_count)
+    bugs_created = np.empty(sprint_count, dtype=np.int64)
+    reopened = np.empty(sprint_count, dtype=np.int64)
+
+    for k in range(sprint_count):
+        i = sprint_count - 1 - k
+        c = float(base_points + (i % 3) * 5 + 5)
+        done = round(min(c + 3, max(0.0, c - (i % 4) * 4 + (i % 2) * 2)), 1)
+        rolled = max(0.0, round(c - done, 1))
+        committed[k] = c
+        completed[k] = done
+        rollover[k] = rolled
+        percent[k] = round(100.0 * (done / c), 1) if c else 0.0
+        roll_percent[k] = round(100.0 * (rolled / c), 1) if c else 0.0
+        dor[k] = float(80 + (i % 5) * 3 - (i % 2))
+        bugs_created[k] = 5 + (i % 4) * 2
+        reopened[k] = i % 3
+
+    return committed, completed, rollover, percent, roll_percent, dor, bugs_created, reopened
+
+
+# Compile (or load from the on-disk cache) at import rather than on the first request
+_sprint_metrics(30, 1)
+
+
+def _build_payload(include_done_only: bool, today: date) -> TeamDashboardResponse:
     """
-    Demo analytics endpoint. In a real implementation we would:
-    - Query the connected work management system (Jira/Azure DevOps)
-    - Or aggregate from our MongoDB where work items are synced
-    For now, we synthesize realistic data deterministically from the inputs.
+    Synthesize the dashboard payload.
+    Only include_done_only shapes the data; team_name is patched in per request by team_dashboard.
     """
     # deterministic seed from team_id
     base_points = 30 if include_done_only else 35
@@ -151,58 +247,57 @@ def team_dashboard(
     rollover_points: List[RolloverPoint] = []
     rows: List[SprintRow] = []
 
-    today = date.today()
+    # Running totals for the KPIs, accumulated in the same pass that builds the rows
+    tot_completed = tot_committed = tot_rollover = tot_dor = 0.0
+    tot_bugs = 0
+
     # Assume sprints are 2 weeks, retros on Mondays
-    for i in range(sprint_count):
-        idx = sprint_count - i
-        sprint_name = f"Sprint {idx}"
-        start = today - timedelta(weeks=(sprint_count - i) * 2)
+    columns = _sprint_metrics(base_points, sprint_count)
+    for n, committed_i, completed_i, rollover_i, percent_i, roll_percent_i, dor_i, bugs_i, reopened_i in zip(
+        range(sprint_count - 1, -1, -1), *(column.tolist() for column in columns)
+    ):
+        idx = sprint_count - n
+        sprint_name = _SPRINT_NAMES[idx - 1]
+        start = today - timedelta(weeks=(sprint_count - n) * 2)
         end = start + timedelta(days=13)
 
-        committed = base_points + (i % 3) * 5 + 5
-        completed = max(0.0, committed - (i % 4) * 4 + ((i % 2) * 2))
-        completed = round(min(committed + 3, completed), 1)
-        rollover = max(0.0, round(committed - completed, 1))
-        percent = round(100.0 * (completed / committed) if committed else 0, 1)
-        roll_percent = round(100.0 * (rollover / committed) if committed else 0, 1)
-        dor = round(80 + (i % 5) * 3 - (i % 2), 1)
-        bugs_created = 5 + (i % 4) * 2
-        reopened = (i % 3)
-
-        velocity.append(VelocityPoint(key=sprint_name, start=start, end=end, committed=committed, completed=completed))
-        commit_vs.append(CommitmentPoint(sprint=sprint_name, committed=committed, completed=completed, rollover=rollover, percent=percent))
-        rollover_points.append(RolloverPoint(sprint=sprint_name, percent=roll_percent, committed=committed, rolled=rollover))
+        velocity.append(VelocityPoint(key=sprint_name, start=start, end=end, committed=committed_i, completed=completed_i))
+        commit_vs.append(CommitmentPoint(sprint=sprint_name, committed=committed_i, completed=completed_i, rollover=rollover_i, percent=percent_i))
+        rollover_points.append(RolloverPoint(sprint=sprint_name, percent=roll_percent_i, committed=committed_i, rolled=rollover_i))
         rows.append(
             SprintRow(
                 sprint=sprint_name,
                 start=start,
                 end=end,
-                committed=committed,
-                completed=completed,
-                completion_percent=percent,
-                rollover_points=rollover,
-                rollover_percent=roll_percent,
-                dor_compliance_percent=dor,
-                bugs_created=bugs_created,
-                items_reopened=reopened,
+                committed=committed_i,
+                completed=completed_i,
+                completion_percent=percent_i,
+                rollover_points=rollover_i,
+                rollover_percent=roll_percent_i,
+                dor_compliance_percent=dor_i,
+                bugs_created=bugs_i,
+                items_reopened=reopened_i,
             )
         )
 
-    # KPIs (averages across range)
-    avg_velocity = round(sum(v.completed for v in velocity) / len(velocity), 1)
-    avg_throughput = round((sum(1 for _ in velocity) * 10) / len(velocity), 1)  # demo placeholder
-    commitment_completion = round(sum(c.completed for c in commit_vs) / sum(c.committed for c in commit_vs) * 100, 1)
-    rollover_rate = round(sum(c.rollover for c in commit_vs) / sum(c.committed for c in commit_vs) * 100, 1)
-    dor_compliance = round(sum(r.dor_compliance_percent for r in rows) / len(rows), 1)
-    bug_ratio = round((sum(r.bugs_created for r in rows) / max(1, len(rows) * 12)), 2)
+        tot_completed += completed_i
+        tot_committed += committed_i
+        tot_rollover += rollover_i
+        tot_dor += dor_i
+        tot_bugs += bugs_i
 
+    # KPIs (averages across range)
+    avg_velocity = round(tot_completed / sprint_count, 1)
+    avg_throughput = round((sprint_count * 10) / sprint_count, 1)  # demo placeholder
+    commitment_completion = round(tot_completed / tot_committed * 100, 1)
+    rollover_rate = round(tot_rollover / tot_committed * 100, 1)
+    dor_compliance = round(tot_dor / sprint_count, 1)
+    bug_ratio = round((tot_bugs / max(1, sprint_count * 12)), 2)
+
+    values = (avg_velocity, avg_throughput, commitment_completion, rollover_rate, dor_compliance, bug_ratio)
     kpis = [
-        KPI(label="Velocity", value=avg_velocity, delta=1.2, help="Average story points completed per sprint in the selected range."),
-        KPI(label="Throughput", value=avg_throughput, delta=-0.5, help="Number of items completed per sprint in the selected range."),
-        KPI(label="Commitment completion %", value=commitment_completion, delta=2.1, help="Completed points divided by points committed at sprint start."),
-        KPI(label="Rollover rate %", value=rollover_rate, delta=-1.4, help="Rolled-over points divided by committed points."),
-        KPI(label="DoR compliance %", value=dor_compliance, delta=0.8, help="Percentage of items that met Definition of Ready before sprint start."),
-        KPI(label="Bug ratio", value=bug_ratio, delta=-0.1, help="Number of bugs divided by number of stories completed."),
+        KPI(label=label, value=value, delta=delta, help=help_text)
+        for (label, delta, help_text), value in zip(_KPI_META, values)
     ]
 
     scope = ScopeSummary(
@@ -211,24 +306,86 @@ def team_dashboard(
         avg_net_percent=round(6.5, 1),
     )
 
-    # Sort by sprint name numeric part descending (latest first)
-    velocity_sorted = list(reversed(velocity))
-    commit_sorted = list(reversed(commit_vs))
-    rollover_sorted = list(reversed(rollover_points))
-    rows_sorted = list(reversed(rows))
-
     return TeamDashboardResponse(
-        team_name=team_name,
+        team_name=DEFAULT_TEAM_NAME,
         kpis=kpis,
-        velocity=velocity_sorted,
-        commitment_vs_completion=commit_sorted,
-        rollover_trend=rollover_sorted,
+        velocity=velocity,
+        commitment_vs_completion=commit_vs,
+        rollover_trend=rollover_points,
         scope_change=scope,
-        sprint_rows=rows_sorted,
+        sprint_rows=rows,
     )
 
 
+@lru_cache(maxsize=4)
+def _encoded_payload(day: int, include_done_only: bool) -> bytes:
+    """Encoded payload for a given date ordinal; rebuilt only when the day rolls over"""
+    return msgspec.json.encode(_build_payload(include_done_only, date.fromordinal(day)))
+
+
+# Warm both variants for today so the first requests don't pay for the build
+for _flag in (False, True):
+    _encoded_payload(date.today().toordinal(), _flag)
+_DEFAULT_TEAM_NAME_JSON = msgspec.json.encode(DEFAULT_TEAM_NAME)
+
+
+@lru_cache(maxsize=32)
+def _etag_for(payload: bytes) -> str:
+    """Strong ETag for an encoded payload"""
+    return '"' + hashlib.blake2b(payload, digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so W/"..." matches our strong tag
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+# The payload is built and encoded by us: no response_model validation, schema kept for the docs
+@app.get(
+    "/api/team-dashboard",
+    response_model=None,
+    responses={200: {"content": {"application/json": {"schema": _DASHBOARD_SCHEMA}}}},
+)
+async def team_dashboard(
+    request: Request,
+    team_id: str = Query("team-1"),
+    team_name: str = Query(DEFAULT_TEAM_NAME),
+    grouping: str = Query("By sprint", pattern="^(By sprint|By week|By month)$"),
+    include_done_only: bool = Query(False),
+    item_types: List[str] = Query(["Stories", "Bugs", "Tasks", "Epics"]) 
+) -> Response:
+    """
+    Demo analytics endpoint. In a real implementation we would:
+    - Query the connected work management system (Jira/Azure DevOps)
+    - Or aggregate from our MongoDB where work items are synced
+    For now, we synthesize realistic data deterministically from the inputs.
+    """
+    payload = _encoded_payload(date.today().toordinal(), include_done_only)
+    if team_name != DEFAULT_TEAM_NAME:
+        # team_name is the first key, so the first match is always that field
+        payload = payload.replace(_DEFAULT_TEAM_NAME_JSON, msgspec.json.encode(team_name), 1)
+
+    etag = _etag_for(payload)
+    headers = {"ETag": etag, "Cache-Control": "max-age=60"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(payload, media_type="application/json", headers=headers)
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # An import string (not the app object) is required for multiple workers
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )